@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import psutil
@@ -5,10 +6,8 @@ from typing import Optional
 from scipy.stats import probplot, chi2_contingency
 
 
-def transform_category_str(category: str):
-    """ "Transforms a category string"""
-    category = category.split("-")[0]
-    religions = [
+RELIGIONS = frozenset(
+    (
         "christianity",
         "islam",
         "hinduism",
@@ -21,25 +20,28 @@ def transform_category_str(category: str):
         "zoroastrianism",
         "spirituality",
         "religion",
-    ]
-    if category in religions:
-        category = "spirituality-religion"
-    if category == "true":
-        category = "true-crime"
+    )
+)
 
-    return category
+CATEGORY_REWRITES = {
+    **{religion: "spirituality-religion" for religion in RELIGIONS},
+    "true": "true-crime",
+}
+
+
+def transform_category_str(category: str):
+    """ "Transforms a category string"""
+    category = category.partition("-")[0]
+    return CATEGORY_REWRITES.get(category, category)
 
 
 def transform_category_list(cat_list: list, leave_set=True):
     """Transforms a list of categories into a aggregated list"""
-    cat_list = [transform_category_str(cat) for cat in cat_list]
-
-    # remove duplicates
+    # set comprehension removes duplicates
+    cat_set = {transform_category_str(cat) for cat in cat_list}
     if leave_set:
-        cat_list = set(cat_list)
-    else:
-        cat_list = list(set(cat_list))
-    return cat_list
+        return cat_set
+    return list(cat_set)
 
 
 def axis_titles(
@@ -57,21 +59,20 @@ def axis_titles(
 def col_frequency_table(df, column_name, index_name=None):
     """Returns a clean frequency table"""
 
-    # Calculate the value counts of the specified column
-    counts = df[column_name].value_counts().to_frame()
+    # Count the values of the specified column, most frequent first
+    counts = (
+        df.groupby(column_name, sort=False, observed=True)
+        .size()
+        .sort_values(ascending=False)
+    )
 
     # Set the index name
     if index_name is None:
         index_name = column_name
     counts.index.name = index_name
 
-    # Rename the column
-    counts.rename(columns={column_name: "Frequency"}, inplace=True)
-
-    # Transpose the table
-    transposed_table = counts.T
-
-    return transposed_table
+    # Build the transposed table directly
+    return pd.DataFrame([counts.values], columns=counts.index, index=["Frequency"])
 
 
 def memory_used():
@@ -82,7 +83,21 @@ def memory_used():
 
 def chi2_test(col1, col2, return_results=False, print_out=True):
     """Returns the chi-squared statistic values"""
-    contingency_table = pd.crosstab(col1, col2)
+    # Pair values by index label, as pd.crosstab does
+    if isinstance(col1, pd.Series) and isinstance(col2, pd.Series):
+        col1, col2 = col1.align(col2, join="inner")
+    name1 = getattr(col1, "name", None) or "row_0"
+    name2 = getattr(col2, "name", None) or "col_0"
+
+    # Build the contingency table from integer codes (missing values dropped)
+    col1, col2 = np.asarray(col1), np.asarray(col2)
+    present = pd.notna(col1) & pd.notna(col2)
+    codes1, labels1 = pd.factorize(col1[present], sort=True)
+    codes2, labels2 = pd.factorize(col2[present], sort=True)
+    contingency_table = np.bincount(
+        codes1 * len(labels2) + codes2,
+        minlength=len(labels1) * len(labels2),
+    ).reshape(len(labels1), len(labels2))
     chi2_stat, p_val, dof, expected_freq = chi2_contingency(contingency_table)
 
     if print_out:
@@ -95,18 +110,23 @@ def chi2_test(col1, col2, return_results=False, print_out=True):
             "p": p_val,
             "dof": dof,
             "freq": expected_freq,
-            "con_table": contingency_table,
+            "con_table": pd.DataFrame(
+                contingency_table,
+                index=pd.Index(labels1, name=name1),
+                columns=pd.Index(labels2, name=name2),
+            ),
         }
 
 
 def pol_points(ratings, freq):
     """Calculates rating polarization points"""
-    points = 0
-    for rating, fre in zip(ratings, freq):
-        if rating in [1, 5]:
-            points += 2 * fre
-        if rating in [2, 4]:
-            points += 1 * fre
+    ratings = np.asarray(ratings)
+    freq = np.asarray(freq)
+    # Extreme ratings weigh 2, moderate ones 1, anything else 0
+    weights = np.where(
+        np.isin(ratings, [1, 5]), 2, np.where(np.isin(ratings, [2, 4]), 1, 0)
+    )
+    points = weights @ freq
     points = points / freq.sum()
     return points
 